@@ -2,8 +2,10 @@
 Unit test for Linear Programming
 """
 import sys
+from functools import lru_cache
 
 import numpy as np
+import scipy.sparse as sps
 from numpy.testing import (assert_, assert_allclose, assert_equal,
                            assert_array_less, assert_warns, suppress_warnings)
 from pytest import raises as assert_raises
@@ -26,20 +28,20 @@ except ImportError:
 
 
 def _assert_iteration_limit_reached(res, maxiter):
-    assert_(not res.success, "Incorrectly reported success")
-    assert_(res.success < maxiter, "Incorrectly reported number of iterations")
+    assert not res.success, "Incorrectly reported success"
+    assert res.nit <= maxiter, "Incorrectly reported number of iterations"
     assert_equal(res.status, 1, "Failed to report iteration limit reached")
 
 
 def _assert_infeasible(res):
     # res: linprog result object
-    assert_(not res.success, "incorrectly reported success")
+    assert not res.success, "incorrectly reported success"
     assert_equal(res.status, 2, "failed to report infeasible status")
 
 
 def _assert_unbounded(res):
     # res: linprog result object
-    assert_(not res.success, "incorrectly reported success")
+    assert not res.success, "incorrectly reported success"
     assert_equal(res.status, 3, "failed to report unbounded status")
 
 
@@ -49,7 +51,7 @@ def _assert_unable_to_find_basic_feasible_sol(res):
     # The status may be either 2 or 4 depending on why the feasible solution
     # could not be found. If the undelying problem is expected to not have a
     # feasible solution, _assert_infeasible should be used.
-    assert_(not res.success, "incorrectly reported success")
+    assert not res.success, "incorrectly reported success"
     assert_(res.status in (2, 4), "failed to report optimization failure")
 
 
@@ -74,97 +76,120 @@ def _assert_success(res, desired_fun=None, desired_x=None,
                         rtol=rtol, atol=atol)
 
 
-def magic_square(n):
+def _magic_square_triplets(n, numbers):
+    """
+    Returns the (row, col, value) triplets of the nonzero elements of the
+    `magic_square` constraint matrix.
+    """
+    # Decision variable (k, i, j) -- number k + 1 in row i, column j -- is
+    # column k*n**2 + i*n + j of A. Each rule has a fixed sparsity pattern,
+    # so fill the triplets of all rules directly rather than filling and
+    # flattening a mostly-zero n**2 x n x n array per row.
+    n2, n4 = n**2, n**4
+    nnz = 4 * n4 + 2 * n**3
+    rows = np.empty(nnz, dtype=np.intp)
+    cols = np.empty(nnz, dtype=np.intp)
+    data = np.empty(nnz, dtype=np.float64)
+
+    k, i, j = (index.ravel() for index in np.indices(numbers.shape))
+    var = np.arange(n4)
+    values = numbers.ravel()
+
+    # Rules 1 to 4 each have one nonzero per decision variable
+    # Rule 1: use every number exactly once
+    rows[:n4] = k
+    # Rule 2: Only one number per square
+    rows[n4:2 * n4] = n2 + i * n + j
+    # Rule 3: sum of rows is M
+    rows[2 * n4:3 * n4] = 2 * n2 + i
+    # Rule 4: sum of columns is M
+    rows[3 * n4:4 * n4] = 2 * n2 + n + j
+    cols[:4 * n4].reshape(4, n4)[:] = var
+    data[:2 * n4] = 1
+    data[2 * n4:4 * n4].reshape(2, n4)[:] = values
+
+    # Rule 5: sum of diagonals is M
+    # Each diagonal has n squares, so n**3 nonzeros per diagonal
+    on_diag = i == j
+    on_anti_diag = i + j == n - 1
+    diag = slice(4 * n4, 4 * n4 + n**3)
+    rows[diag] = 2 * n2 + 2 * n
+    cols[diag] = var[on_diag]
+    data[diag] = values[on_diag]
+    anti_diag = slice(4 * n4 + n**3, nnz)
+    rows[anti_diag] = 2 * n2 + 2 * n + 1
+    cols[anti_diag] = var[on_anti_diag]
+    data[anti_diag] = values[on_anti_diag]
+
+    return rows, cols, data
+
+
+def _read_only(*arrays):
+    # shared test data; tests must copy before mutating
+    for array in arrays:
+        if sps.issparse(array):
+            _read_only(array.data, array.indices, array.indptr)
+        else:
+            array.flags.writeable = False
+    return arrays
+
+
+@lru_cache()
+def magic_square(n, sparse=False):
     """
     Generates a linear program for which integer solutions represent an
     n x n magic square; binary decision variables represent the presence
     (or absence) of an integer 1 to n^2 in each position of the square.
+    If `sparse` is True, the constraint matrix is returned as a
+    `scipy.sparse.csr_matrix` rather than a dense array.
     """
 
-    np.random.seed(0)
+    rng = np.random.RandomState(0)
     M = n * (n**2 + 1) / 2
 
-    numbers = np.arange(n**4) // n**2 + 1
+    # int32 suffices; values are cast to float64 as they are written into
+    # the constraint triplets
+    numbers = np.arange(n**4, dtype=np.int32) // n**2 + 1
 
     numbers = numbers.reshape(n**2, n, n)
 
-    zeros = np.zeros((n**2, n, n))
+    rows, cols, data = _magic_square_triplets(n, numbers)
+    shape = (2 * n**2 + 2 * n + 2, n**4)
+    A = sps.coo_matrix((data, (rows, cols)), shape=shape)
+    A = A.tocsr() if sparse else A.toarray()
+    b = np.concatenate((np.ones(2 * n**2), np.full(2 * n + 2, M)))
+    c = rng.rand(A.shape[1])
 
-    A_list = []
-    b_list = []
+    return _read_only(A, b, c, numbers)
 
-    # Rule 1: use every number exactly once
-    for i in range(n**2):
-        A_row = zeros.copy()
-        A_row[i, :, :] = 1
-        A_list.append(A_row.flatten())
-        b_list.append(1)
 
-    # Rule 2: Only one number per square
-    for i in range(n):
-        for j in range(n):
-            A_row = zeros.copy()
-            A_row[:, i, j] = 1
-            A_list.append(A_row.flatten())
-            b_list.append(1)
-
-    # Rule 3: sum of rows is M
-    for i in range(n):
-        A_row = zeros.copy()
-        A_row[:, i, :] = numbers[:, i, :]
-        A_list.append(A_row.flatten())
-        b_list.append(M)
-
-    # Rule 4: sum of columns is M
-    for i in range(n):
-        A_row = zeros.copy()
-        A_row[:, :, i] = numbers[:, :, i]
-        A_list.append(A_row.flatten())
-        b_list.append(M)
-
-    # Rule 5: sum of diagonals is M
-    A_row = zeros.copy()
-    A_row[:, range(n), range(n)] = numbers[:, range(n), range(n)]
-    A_list.append(A_row.flatten())
-    b_list.append(M)
-    A_row = zeros.copy()
-    A_row[:, range(n), range(-1, -n - 1, -1)] = \
-        numbers[:, range(n), range(-1, -n - 1, -1)]
-    A_list.append(A_row.flatten())
-    b_list.append(M)
-
-    A = np.array(np.vstack(A_list), dtype=float)
-    b = np.array(b_list, dtype=float)
-    c = np.random.rand(A.shape[1])
-
-    return A, b, c, numbers
-
-
-def lpgen_2d(m, n):
+@lru_cache()
+def lpgen_2d(m, n, sparse=False):
     """ -> A b c LP test: m*n vars, m+n constraints
         row sums == n/m, col sums == 1
         https://gist.github.com/denis-bz/8647461
+        A is a C-ordered dense array, or a `scipy.sparse.csc_matrix`
+        if `sparse` is True.
     """
-    np.random.seed(0)
-    c = - np.random.exponential(size=(m, n))
-    Arow = np.zeros((m, m * n))
-    brow = np.zeros(m)
-    for j in range(m):
-        j1 = j + 1
-        Arow[j, j * n:j1 * n] = 1
-        brow[j] = n / m
+    rng = np.random.RandomState(0)
+    c = - rng.exponential(size=(m, n))
+    Arow = sps.kron(sps.eye(m), np.ones((1, n)))
+    Acol = sps.kron(np.ones((1, m)), sps.eye(n))
+    A = sps.vstack((Arow, Acol), format="csc")
+    A = A if sparse else A.toarray(order='C')
+
+    b = np.empty(m + n)
+    b[:m] = n / m  # row sums
+    b[m:] = 1  # column sums
 
-    Acol = np.zeros((n, m * n))
-    bcol = np.zeros(n)
-    for j in range(n):
-        j1 = j + 1
-        Acol[j, j::n] = 1
-        bcol[j] = 1
+    return _read_only(A, b, c.ravel())
 
-    A = np.vstack((Arow, Acol))
-    b = np.hstack((brow, bcol))
 
-    return A, b, c.ravel()
+@lru_cache()
+def _enzo_c_A_eq(m, start):
+    # equality constraints of the enzo_example_c problems
+    tmp = 2 * np.pi * np.arange(start, start + m) / (m + 1)
+    return _read_only(np.vstack((np.cos(tmp) - 1, np.sin(tmp))))[0]
 
 
 def nontrivial_problem():
@@ -181,41 +206,200 @@ def nontrivial_problem():
     return c, A_ub, b_ub, A_eq, b_eq, x_star, f_star
 
 
+def _random_arrays(seed, *shapes):
+    # uniform random arrays of the given shapes, drawn in order from a
+    # fresh RandomState(seed)
+    rng = np.random.RandomState(seed)
+    return _read_only(*(rng.rand(*shape) for shape in shapes))
+
+
+# Random problem data is drawn once at import. The zero column tests were
+# written against np.random.seed(0), so their data reproduce that stream,
+# with the arrays in the order those tests drew them.
+_ZERO_COLUMN_1 = _random_arrays(0, (4,), (3, 4), (3,))
+_ZERO_COLUMN_2 = _random_arrays(0, (4,), (2, 4), (2,), (2, 4), (2,))
+_ZERO_ROW_3 = _random_arrays(1, (4,), (2, 4), (2,))
+_ZERO_ROW_4 = _random_arrays(2, (4,), (2, 4), (2,))
+_REDUNDANCY_INFEASIBILITY = _random_arrays(3, (10,), (10, 10), (10,))
+
+
+def _lp_arrays(*data):
+    # constant problem data, stored once as C-contiguous float64 arrays so
+    # linprog receives its preferred layout
+    return _read_only(*(np.array(x, dtype=np.float64, order='C')
+                        for x in data))
+
+
+def _network_flow_problem():
+    # https://www.princeton.edu/~rvdb/542/lectures/lec10.pdf
+    c = [2, 4, 9, 11, 4, 3, 8, 7, 0, 15, 16, 18]
+    n, p = -1, 1
+    A_eq = [
+        [n, n, p, 0, p, 0, 0, 0, 0, p, 0, 0],
+        [p, 0, 0, p, 0, p, 0, 0, 0, 0, 0, 0],
+        [0, 0, n, n, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, p, p, 0, 0, p, 0],
+        [0, 0, 0, 0, n, n, n, 0, p, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, n, n, 0, 0, p],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, n, n, n]]
+    b_eq = [0, 19, -16, 33, 0, 0, -36]
+    return _lp_arrays(c, A_eq, b_eq)
+
+
+def _wikipedia_example_problem():
+    # https://en.wikipedia.org/wiki/Simplex_algorithm#Example
+    c = [-2, -3, -4]
+    A_ub = [
+        [3, 2, 1],
+        [2, 5, 3]]
+    b_ub = [10, 15]
+    return _lp_arrays(c, A_ub, b_ub)
+
+
+def _bug_5400_problem():
+    # https://github.com/scipy/scipy/issues/5400
+    bounds = [
+        (0, None),
+        (0, 100), (0, 100), (0, 100), (0, 100), (0, 100), (0, 100),
+        (0, 900), (0, 900), (0, 900), (0, 900), (0, 900), (0, 900),
+        (0, None), (0, None), (0, None), (0, None), (0, None), (0, None)]
+
+    f = 1 / 9
+    g = -1e4
+    h = -3.1
+    A_ub = np.array([
+        [1, -2.99, 0, 0, -3, 0, 0, 0, -1, -1, 0, -1, -1, 1, 1, 0, 0, 0, 0],
+        [1, 0, -2.9, h, 0, -3, 0, -1, 0, 0, -1, 0, -1, 0, 0, 1, 1, 0, 0],
+        [1, 0, 0, h, 0, 0, -3, -1, -1, 0, -1, -1, 0, 0, 0, 0, 0, 1, 1],
+        [0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1],
+        [0, 1.99, -1, -1, 0, 0, 0, -1, f, f, 0, 0, 0, g, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 2, -1, -1, 0, 0, 0, -1, f, f, 0, g, 0, 0, 0, 0],
+        [0, -1, 1.9, 2.1, 0, 0, 0, f, -1, -1, 0, 0, 0, 0, 0, g, 0, 0, 0],
+        [0, 0, 0, 0, -1, 2, -1, 0, 0, 0, f, -1, f, 0, 0, 0, g, 0, 0],
+        [0, -1, -1, 2.1, 0, 0, 0, f, f, -1, 0, 0, 0, 0, 0, 0, 0, g, 0],
+        [0, 0, 0, 0, -1, -1, 2, 0, 0, 0, f, f, -1, 0, 0, 0, 0, 0, g]])
+
+    b_ub = np.array([
+        0.0, 0, 0, 100, 100, 100, 100, 100, 100, 900, 900, 900, 900, 900,
+        900, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+
+    c = np.array([-1.0, 1, 1, 1, 1, 1, 1, 1, 1,
+                  1, 1, 1, 1, 0, 0, 0, 0, 0, 0])
+    return _lp_arrays(c, A_ub, b_ub) + (bounds,)
+
+
+def _bug_6139_problem():
+    # https://github.com/scipy/scipy/issues/6139
+    c = np.array([1, 1, 1])
+    A_eq = np.array([[1., 0., 0.], [-1000., 0., - 1000.]])
+    b_eq = np.array([5.00000000e+00, -1.00000000e+04])
+    A_ub = -np.array([[0., 1000000., 1010000.]])
+    b_ub = -np.array([10000000.])
+    return _lp_arrays(c, A_ub, b_ub, A_eq, b_eq)
+
+
+def _bug_6690_problem():
+    # https://github.com/scipy/scipy/issues/6690
+    A_eq = np.array([[0, 0, 0, 0.93, 0, 0.65, 0, 0, 0.83, 0]])
+    b_eq = np.array([0.9626])
+    A_ub = np.array([
+        [0, 0, 0, 1.18, 0, 0, 0, -0.2, 0, -0.22],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0.43, 0, 0, 0, 0, 0, 0],
+        [0, -1.22, -0.25, 0, 0, 0, -2.06, 0, 0, 1.37],
+        [0, 0, 0, 0, 0, 0, 0, -0.25, 0, 0]
+    ])
+    b_ub = np.array([0.615, 0, 0.172, -0.869, -0.022])
+    bounds = np.array([
+        [-0.84, -0.97, 0.34, 0.4, -0.33, -0.74, 0.47, 0.09, -1.45, -0.73],
+        [0.37, 0.02, 2.86, 0.86, 1.18, 0.5, 1.76, 0.17, 0.32, -0.15]
+    ]).T
+    c = np.array([
+        -1.64, 0.7, 1.8, -1.06, -1.16, 0.26, 2.13, 1.53, 0.66, 0.28
+        ])
+    return _lp_arrays(c, A_ub, b_ub, A_eq, b_eq, bounds)
+
+
+# single variable problems
+_C1, _A11, _B3 = _lp_arrays([1.0], [[1.0]], [3.0])
+# maximize 3*x0 + 2*x1 subject to three inequality constraints
+_INEQUALITY_PROBLEM = _lp_arrays([-3, -2], [[2, 1], [1, 1], [1, 0]],
+                                 [10, 8, 4])
+# three variables fixed by identity equality constraints
+_IDENTITY_3 = _lp_arrays(np.ones(3), np.eye(3), [1, 2, 3])
+
+# like nontrivial_problem, each problem is (c, A_ub, b_ub, A_eq, b_eq, bounds)
+# without the parts it does not use
+_NETWORK_FLOW = _network_flow_problem()
+_WIKIPEDIA_EXAMPLE = _wikipedia_example_problem()
+_BUG_5400 = _bug_5400_problem()
+_BUG_6139 = _bug_6139_problem()
+_BUG_6690 = _bug_6690_problem()
+
+
 def generic_callback_test(self):
     # Check that callback is as advertised
-    last_cb = {}
+    cb_results = []
 
     def cb(res):
-        message = res.pop('message')
-        complete = res.pop('complete')
-
-        assert_(res.pop('phase') in (1, 2))
-        assert_(res.pop('status') in range(4))
-        assert_(isinstance(res.pop('nit'), int))
-        assert_(isinstance(complete, bool))
-        assert_(isinstance(message, str))
-
-        last_cb['x'] = res['x']
-        last_cb['fun'] = res['fun']
-        last_cb['slack'] = res['slack']
-        last_cb['con'] = res['con']
-
-    c = np.array([-3, -2])
-    A_ub = [[2, 1], [1, 1], [1, 0]]
-    b_ub = [10, 8, 4]
+        # only record each result; it is checked after linprog returns
+        cb_results.append(res)
+
+    c, A_ub, b_ub = _INEQUALITY_PROBLEM
     res = linprog(c, A_ub=A_ub, b_ub=b_ub, callback=cb, method=self.method)
 
     _assert_success(res, desired_fun=-18.0, desired_x=[2, 6])
+    for cb_res in cb_results:
+        assert_(cb_res['phase'] in (1, 2))
+        assert_(cb_res['status'] in range(4))
+        assert_(isinstance(cb_res['nit'], int))
+        assert_(isinstance(cb_res['complete'], bool))
+        assert_(isinstance(cb_res['message'], str))
+
+    last_cb = cb_results[-1]
     assert_allclose(last_cb['fun'], res['fun'])
     assert_allclose(last_cb['x'], res['x'])
     assert_allclose(last_cb['con'], res['con'])
     assert_allclose(last_cb['slack'], res['slack'])
 
 
+def generic_lpgen_test(self, sparse=False):
+    # Test linprog  with a rather large problem (400 variables,
+    # 40 constraints) generated by https://gist.github.com/denis-bz/8647461
+    A_ub, b_ub, c = lpgen_2d(20, 20, sparse=sparse)
+    # pass a writable copy so that linprog modifying its input is detected
+    A_ub = A_ub.copy()
+
+    with suppress_warnings() as sup:
+        sup.filter(OptimizeWarning, "Solving system with option 'sym_pos'")
+        sup.filter(RuntimeWarning, "invalid value encountered")
+        sup.filter(LinAlgWarning)
+        res = linprog(c, A_ub=A_ub, b_ub=b_ub, method=self.method,
+                      options=self.options)
+    _assert_success(res, desired_fun=-64.049494229)
+    A_ub = A_ub.toarray() if sparse else A_ub
+    assert_equal(A_ub, lpgen_2d(20, 20)[0])
+
+
 def test_unknown_solver():
-    c = np.array([-3, -2])
-    A_ub = [[2, 1], [1, 1], [1, 0]]
-    b_ub = [10, 8, 4]
+    c, A_ub, b_ub = _INEQUALITY_PROBLEM
 
     assert_raises(ValueError, linprog,
                   c, A_ub=A_ub, b_ub=b_ub, method='ekki-ekki-ekki')
@@ -279,28 +463,22 @@ class LinprogCommonTests(object):
     def test_aliasing_b_ub(self):
         # (presumably) checks that linprog does not modify b_ub
         # This is tested more carefully in test__linprog_clean_inputs.py
-        c = np.array([1.0])
-        A_ub = np.array([[1.0]])
-        b_ub_orig = np.array([3.0])
-        b_ub = b_ub_orig.copy()
+        b_ub = _B3.copy()
         bounds = (-4.0, np.inf)
-        res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
+        res = linprog(_C1, _A11, b_ub, A_eq, b_eq, bounds,
                       method=self.method, options=self.options)
         _assert_success(res, desired_fun=-4, desired_x=[-4])
-        assert_allclose(b_ub_orig, b_ub)
+        assert_allclose(_B3, b_ub)
 
     def test_aliasing_b_eq(self):
         # (presumably) checks that linprog does not modify b_eq
         # This is tested more carefully in test__linprog_clean_inputs.py
-        c = np.array([1.0])
-        A_eq = np.array([[1.0]])
-        b_eq_orig = np.array([3.0])
-        b_eq = b_eq_orig.copy()
+        b_eq = _B3.copy()
         bounds = (-4.0, np.inf)
-        res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
+        res = linprog(_C1, A_ub, b_ub, _A11, b_eq, bounds,
                       method=self.method, options=self.options)
         _assert_success(res, desired_fun=3, desired_x=[3])
-        assert_allclose(b_eq_orig, b_eq)
+        assert_allclose(_B3, b_eq)
 
     def test_non_ndarray_args(self):
         # (presumably) checks that linprog accepts list in place of arrays
@@ -316,9 +494,7 @@ class LinprogCommonTests(object):
         _assert_success(res, desired_fun=2, desired_x=[2])
 
     def test_unknown_options(self):
-        c = np.array([-3, -2])
-        A_ub = [[2, 1], [1, 1], [1, 0]]
-        b_ub = [10, 8, 4]
+        c, A_ub, b_ub = _INEQUALITY_PROBLEM
 
         def f(c, A_ub=None, b_ub=None, A_eq=None,
               b_eq=None, bounds=None, options={}):
@@ -331,33 +507,32 @@ class LinprogCommonTests(object):
         assert_warns(OptimizeWarning, f,
                      c, A_ub=A_ub, b_ub=b_ub, options=o)
 
-    def test_invalid_inputs(self):
+    # Removed [(5, 0), (1, 2), (3, 4)]: these are invalid bounds but should be subject to a check in _presolve, not in _clean_inputs.
+    # The optimization should exit with an 'infeasible problem' error, not with a ValueError
+    # Same for [(1, 2), (np.inf, np.inf), (3, 4)] and [(1, 2), (-np.inf, -np.inf), (3, 4)]
+    @pytest.mark.parametrize("bad_bound", [[(1, 2), (3, 4)],
+                                           [(1, 2), (3, 4), (3, 4, 5)]])
+    def test_invalid_bounds(self, bad_bound):
+        assert_raises(ValueError, linprog, [1, 2, 3], bounds=bad_bound,
+                      method=self.method, options=self.options)
 
-        def f(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, bounds=None):
-            linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
-                    method=self.method, options=self.options)
-
-        # Removed [(5, 0), (1, 2), (3, 4)]: these are invalid bounds but should be subject to a check in _presolve, not in _clean_inputs.
-        # The optimization should exit with an 'infeasible problem' error, not with a ValueError
-        # Same for [(1, 2), (np.inf, np.inf), (3, 4)] and [(1, 2), (-np.inf, -np.inf), (3, 4)]
-        for bad_bound in [[(1, 2), (3, 4)],
-                          [(1, 2), (3, 4), (3, 4, 5)],
-                          ]:
-            assert_raises(ValueError, f, [1, 2, 3], bounds=bad_bound)
-
-        assert_raises(ValueError, f, [1, 2], A_ub=[[1, 2]], b_ub=[1, 2])
-        assert_raises(ValueError, f, [1, 2], A_ub=[[1]], b_ub=[1])
-        assert_raises(ValueError, f, [1, 2], A_eq=[[1, 2]], b_eq=[1, 2])
-        assert_raises(ValueError, f, [1, 2], A_eq=[[1]], b_eq=[1])
-        assert_raises(ValueError, f, [1, 2], A_eq=[1], b_eq=1)
-
-        # this last check doesn't make sense for sparse presolve
-        if ("_sparse_presolve" in self.options and
-                self.options["_sparse_presolve"]):
-            return
-            # there aren't 3-D sparse matrices
-
-        assert_raises(ValueError, f, [1, 2], A_ub=np.zeros((1, 1, 3)), b_eq=1)
+    @pytest.mark.parametrize("constraints", [
+        {"A_ub": [[1, 2]], "b_ub": [1, 2]},
+        {"A_ub": [[1]], "b_ub": [1]},
+        {"A_eq": [[1, 2]], "b_eq": [1, 2]},
+        {"A_eq": [[1]], "b_eq": [1]},
+        {"A_eq": [1], "b_eq": 1}])
+    def test_invalid_constraints(self, constraints):
+        assert_raises(ValueError, linprog, [1, 2],
+                      method=self.method, options=self.options, **constraints)
+
+    def test_invalid_constraints_3d(self):
+        # this check doesn't make sense for sparse presolve
+        if self.options.get("_sparse_presolve", False):
+            pytest.skip("there aren't 3-D sparse matrices")
+
+        assert_raises(ValueError, linprog, [1, 2], A_ub=np.zeros((1, 1, 3)),
+                      b_eq=1, method=self.method, options=self.options)
 
     def test_empty_constraint_1(self):
         c = [-1, -2]
@@ -384,11 +559,7 @@ class LinprogCommonTests(object):
     def test_inequality_constraints(self):
         # Minimize linear function subject to linear inequality constraints.
         #  http://www.dam.brown.edu/people/huiwang/classes/am121/Archive/simplex_121_c.pdf
-        c = np.array([3, 2]) * -1  # maximize
-        A_ub = [[2, 1],
-                [1, 1],
-                [1, 0]]
-        b_ub = [10, 8, 4]
+        c, A_ub, b_ub = _INEQUALITY_PROBLEM  # maximize 3*x0 + 2*x1
         res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
                       method=self.method, options=self.options)
         _assert_success(res, desired_fun=-18, desired_x=[2, 6])
@@ -419,46 +590,23 @@ class LinprogCommonTests(object):
         _assert_success(res, desired_x=[1, 1])
 
     def test_bounded_below_only_1(self):
-        c = np.array([1.0])
-        A_eq = np.array([[1.0]])
-        b_eq = np.array([3.0])
         bounds = (1.0, None)
-        res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
+        res = linprog(_C1, A_ub, b_ub, _A11, _B3, bounds,
                       method=self.method, options=self.options)
         _assert_success(res, desired_fun=3, desired_x=[3])
 
-    def test_bounded_below_only_2(self):
-        c = np.ones(3)
-        A_eq = np.eye(3)
-        b_eq = np.array([1, 2, 3])
-        bounds = (0.5, np.inf)
-        res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
-                      method=self.method, options=self.options)
-        _assert_success(res, desired_x=b_eq, desired_fun=np.sum(b_eq))
-
     def test_bounded_above_only_1(self):
-        c = np.array([1.0])
-        A_eq = np.array([[1.0]])
-        b_eq = np.array([3.0])
         bounds = (None, 10.0)
-        res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
+        res = linprog(_C1, A_ub, b_ub, _A11, _B3, bounds,
                       method=self.method, options=self.options)
         _assert_success(res, desired_fun=3, desired_x=[3])
 
-    def test_bounded_above_only_2(self):
-        c = np.ones(3)
-        A_eq = np.eye(3)
-        b_eq = np.array([1, 2, 3])
-        bounds = (-np.inf, 4)
-        res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
-                      method=self.method, options=self.options)
-        _assert_success(res, desired_x=b_eq, desired_fun=np.sum(b_eq))
-
-    def test_bounds_infinity(self):
-        c = np.ones(3)
-        A_eq = np.eye(3)
-        b_eq = np.array([1, 2, 3])
-        bounds = (-np.inf, np.inf)
+    @pytest.mark.parametrize("bounds", [(0.5, np.inf), (-np.inf, 4),
+                                        (-np.inf, np.inf)],
+                             ids=["below_only", "above_only", "infinity"])
+    def test_bounds_identity_constraints(self, bounds):
+        # solution x = b_eq lies within each set of bounds
+        c, A_eq, b_eq = _IDENTITY_3
         res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
                       method=self.method, options=self.options)
         _assert_success(res, desired_x=b_eq, desired_fun=np.sum(b_eq))
@@ -513,13 +661,9 @@ class LinprogCommonTests(object):
         _assert_infeasible(res)
 
     def test_zero_column_1(self):
-        m, n = 3, 4
-        np.random.seed(0)
-        c = np.random.rand(n)
+        c, A_eq, b_eq = (array.copy() for array in _ZERO_COLUMN_1)
         c[1] = 1
-        A_eq = np.random.rand(m, n)
         A_eq[:, 1] = 0
-        b_eq = np.random.rand(m)
         A_ub = [[1, 0, 1, 1]]
         b_ub = 3
         bounds = [(-10, 10), (-10, 10), (-10, None), (None, None)]
@@ -528,17 +672,10 @@ class LinprogCommonTests(object):
         _assert_success(res, desired_fun=-9.7087836730413404)
 
     def test_zero_column_2(self):
-        np.random.seed(0)
-        m, n = 2, 4
-        c = np.random.rand(n)
+        c, A_eq, b_eq, A_ub, b_ub = (array.copy() for array in _ZERO_COLUMN_2)
         c[1] = -1
-        A_eq = np.random.rand(m, n)
         A_eq[:, 1] = 0
-        b_eq = np.random.rand(m)
-
-        A_ub = np.random.rand(m, n)
         A_ub[:, 1] = 0
-        b_ub = np.random.rand(m)
         bounds = (None, None)
         res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
                       method=self.method, options=self.options)
@@ -564,11 +701,8 @@ class LinprogCommonTests(object):
         _assert_success(res, desired_fun=0)
 
     def test_zero_row_3(self):
-        m, n = 2, 4
-        c = np.random.rand(n)
-        A_eq = np.random.rand(m, n)
+        c, A_eq, b_eq = (array.copy() for array in _ZERO_ROW_3)
         A_eq[0, :] = 0
-        b_eq = np.random.rand(m)
         res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
                       method=self.method, options=self.options)
         _assert_infeasible(res)
@@ -578,11 +712,9 @@ class LinprogCommonTests(object):
             assert_equal(res.nit, 0)
 
     def test_zero_row_4(self):
-        m, n = 2, 4
-        c = np.random.rand(n)
-        A_ub = np.random.rand(m, n)
+        c, A_ub, b_ub = (array.copy() for array in _ZERO_ROW_4)
         A_ub[0, :] = 0
-        b_ub = -np.random.rand(m)
+        b_ub *= -1
         res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
                       method=self.method, options=self.options)
         _assert_infeasible(res)
@@ -759,10 +891,8 @@ class LinprogCommonTests(object):
     def test_remove_redundancy_infeasibility(self):
         # mostly a test of redundancy removal, which is carefully tested in
         # test__remove_redundancy.py
-        m, n = 10, 10
-        c = np.random.rand(n)
-        A_eq = np.random.rand(m, n)
-        b_eq = np.random.rand(m)
+        c, A_eq, b_eq = (array.copy()
+                         for array in _REDUNDANCY_INFEASIBILITY)
         A_eq[-1, :] = 2 * A_eq[-2, :]
         b_eq[-1] *= -1
         with suppress_warnings() as sup:
@@ -784,33 +914,13 @@ class LinprogCommonTests(object):
         _assert_success(res, desired_fun=f_star, desired_x=x_star)
 
     def test_lpgen_problem(self):
-        # Test linprog  with a rather large problem (400 variables,
-        # 40 constraints) generated by https://gist.github.com/denis-bz/8647461
-        A_ub, b_ub, c = lpgen_2d(20, 20)
-
-        with suppress_warnings() as sup:
-            sup.filter(OptimizeWarning, "Solving system with option 'sym_pos'")
-            sup.filter(RuntimeWarning, "invalid value encountered")
-            sup.filter(LinAlgWarning)
-            res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
-                          method=self.method, options=self.options)
-        _assert_success(res, desired_fun=-64.049494229)
+        generic_lpgen_test(self)
 
     def test_network_flow(self):
         # A network flow problem with supply and demand at nodes
         # and with costs along directed edges.
         # https://www.princeton.edu/~rvdb/542/lectures/lec10.pdf
-        c = [2, 4, 9, 11, 4, 3, 8, 7, 0, 15, 16, 18]
-        n, p = -1, 1
-        A_eq = [
-            [n, n, p, 0, p, 0, 0, 0, 0, p, 0, 0],
-            [p, 0, 0, p, 0, p, 0, 0, 0, 0, 0, 0],
-            [0, 0, n, n, 0, 0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, p, p, 0, 0, p, 0],
-            [0, 0, 0, 0, n, n, n, 0, p, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, n, n, 0, 0, p],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, n, n, n]]
-        b_eq = [0, 19, -16, 33, 0, 0, -36]
+        c, A_eq, b_eq = _NETWORK_FLOW
         with suppress_warnings() as sup:
             sup.filter(LinAlgWarning)
             res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
@@ -850,11 +960,7 @@ class LinprogCommonTests(object):
 
     def test_simplex_algorithm_wikipedia_example(self):
         # https://en.wikipedia.org/wiki/Simplex_algorithm#Example
-        c = [-2, -3, -4]
-        A_ub = [
-            [3, 2, 1],
-            [2, 5, 3]]
-        b_ub = [10, 15]
+        c, A_ub, b_ub = _WIKIPEDIA_EXAMPLE
         res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
                       method=self.method, options=self.options)
         _assert_success(res, desired_fun=-20)
@@ -900,8 +1006,7 @@ class LinprogCommonTests(object):
         # rescued from https://github.com/scipy/scipy/pull/218
         m = 20
         c = -np.ones(m)
-        tmp = 2 * np.pi * np.arange(1, m + 1) / (m + 1)
-        A_eq = np.vstack((np.cos(tmp) - 1, np.sin(tmp)))
+        A_eq = _enzo_c_A_eq(m, 1)
         b_eq = [0, 0]
         res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
                       method=self.method, options=self.options)
@@ -911,8 +1016,7 @@ class LinprogCommonTests(object):
         # rescued from https://github.com/scipy/scipy/pull/218
         m = 50
         c = -np.ones(m)
-        tmp = 2 * np.pi * np.arange(m) / (m + 1)
-        A_eq = np.vstack((np.cos(tmp) - 1, np.sin(tmp)))
+        A_eq = _enzo_c_A_eq(m, 0)
         b_eq = [0, 0]
         res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
                       method=self.method, options=self.options)
@@ -922,8 +1026,7 @@ class LinprogCommonTests(object):
         # rescued from https://github.com/scipy/scipy/pull/218
         m = 50
         c = -np.ones(m)
-        tmp = 2 * np.pi * np.arange(m) / (m + 1)
-        A_eq = np.vstack((np.cos(tmp) - 1, np.sin(tmp)))
+        A_eq = _enzo_c_A_eq(m, 0)
         b_eq = [1, 1]
 
         o = {key: self.options[key] for key in self.options}
@@ -956,50 +1059,7 @@ class LinprogCommonTests(object):
 
     def test_bug_5400(self):
         # https://github.com/scipy/scipy/issues/5400
-        bounds = [
-            (0, None),
-            (0, 100), (0, 100), (0, 100), (0, 100), (0, 100), (0, 100),
-            (0, 900), (0, 900), (0, 900), (0, 900), (0, 900), (0, 900),
-            (0, None), (0, None), (0, None), (0, None), (0, None), (0, None)]
-
-        f = 1 / 9
-        g = -1e4
-        h = -3.1
-        A_ub = np.array([
-            [1, -2.99, 0, 0, -3, 0, 0, 0, -1, -1, 0, -1, -1, 1, 1, 0, 0, 0, 0],
-            [1, 0, -2.9, h, 0, -3, 0, -1, 0, 0, -1, 0, -1, 0, 0, 1, 1, 0, 0],
-            [1, 0, 0, h, 0, 0, -3, -1, -1, 0, -1, -1, 0, 0, 0, 0, 0, 1, 1],
-            [0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1],
-            [0, 1.99, -1, -1, 0, 0, 0, -1, f, f, 0, 0, 0, g, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 2, -1, -1, 0, 0, 0, -1, f, f, 0, g, 0, 0, 0, 0],
-            [0, -1, 1.9, 2.1, 0, 0, 0, f, -1, -1, 0, 0, 0, 0, 0, g, 0, 0, 0],
-            [0, 0, 0, 0, -1, 2, -1, 0, 0, 0, f, -1, f, 0, 0, 0, g, 0, 0],
-            [0, -1, -1, 2.1, 0, 0, 0, f, f, -1, 0, 0, 0, 0, 0, 0, 0, g, 0],
-            [0, 0, 0, 0, -1, -1, 2, 0, 0, 0, f, f, -1, 0, 0, 0, 0, 0, g]])
-
-        b_ub = np.array([
-            0.0, 0, 0, 100, 100, 100, 100, 100, 100, 900, 900, 900, 900, 900,
-            900, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
-
-        c = np.array([-1.0, 1, 1, 1, 1, 1, 1, 1, 1,
-                      1, 1, 1, 1, 0, 0, 0, 0, 0, 0])
+        c, A_ub, b_ub, bounds = _BUG_5400
         with suppress_warnings() as sup:
             sup.filter(OptimizeWarning,
                        "Solving system with option 'sym_pos'")
@@ -1018,11 +1078,7 @@ class LinprogCommonTests(object):
         # if a result is "close enough" to zero and should not be expected
         # to work for all cases.
 
-        c = np.array([1, 1, 1])
-        A_eq = np.array([[1., 0., 0.], [-1000., 0., - 1000.]])
-        b_eq = np.array([5.00000000e+00, -1.00000000e+04])
-        A_ub = -np.array([[0., 1000000., 1010000.]])
-        b_ub = -np.array([10000000.])
+        c, A_ub, b_ub, A_eq, b_eq = _BUG_6139
         bounds = (None, None)
 
         res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
@@ -1036,24 +1092,7 @@ class LinprogCommonTests(object):
         # success.
         # https://github.com/scipy/scipy/issues/6690
 
-        A_eq = np.array([[0, 0, 0, 0.93, 0, 0.65, 0, 0, 0.83, 0]])
-        b_eq = np.array([0.9626])
-        A_ub = np.array([
-            [0, 0, 0, 1.18, 0, 0, 0, -0.2, 0, -0.22],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0.43, 0, 0, 0, 0, 0, 0],
-            [0, -1.22, -0.25, 0, 0, 0, -2.06, 0, 0, 1.37],
-            [0, 0, 0, 0, 0, 0, 0, -0.25, 0, 0]
-        ])
-        b_ub = np.array([0.615, 0, 0.172, -0.869, -0.022])
-        bounds = np.array([
-            [-0.84, -0.97, 0.34, 0.4, -0.33, -0.74, 0.47, 0.09, -1.45, -0.73],
-            [0.37, 0.02, 2.86, 0.86, 1.18, 0.5, 1.76, 0.17, 0.32, -0.15]
-        ]).T
-        c = np.array([
-            -1.64, 0.7, 1.8, -1.06, -1.16, 0.26, 2.13, 1.53, 0.66, 0.28
-            ])
-
+        c, A_ub, b_ub, A_eq, b_eq, bounds = _BUG_6690
         with suppress_warnings() as sup:
             if has_umfpack:
                 sup.filter(UmfpackWarning)
@@ -1535,7 +1574,7 @@ class TestLinprogIPSparse(LinprogIPTests):
 
     def test_magic_square_sparse_no_presolve(self):
         # test linprog with a problem with a rank-deficient A_eq matrix
-        A_eq, b_eq, c, N = magic_square(3)
+        A_eq, b_eq, c, N = magic_square(3, sparse=True)
         bounds = (0, 1)
 
         with suppress_warnings() as sup:
@@ -1551,9 +1590,12 @@ class TestLinprogIPSparse(LinprogIPTests):
                           method=self.method, options=o)
         _assert_success(res, desired_fun=1.730550597)
 
+    def test_lpgen_problem_sparse_input(self):
+        generic_lpgen_test(self, sparse=True)
+
     def test_sparse_solve_options(self):
         # checking that problem is solved with all column permutation options
-        A_eq, b_eq, c, N = magic_square(3)
+        A_eq, b_eq, c, N = magic_square(3, sparse=True)
         with suppress_warnings() as sup:
             sup.filter(OptimizeWarning, "A_eq does not appear...")
             sup.filter(OptimizeWarning, "Invalid permc_spec option")
@@ -1638,7 +1680,7 @@ class TestLinprogIPSpecific(object):
     def test_maxiter(self):
         # test iteration limit
         A, b, c = lpgen_2d(20, 20)
-        maxiter = np.random.randint(6) + 1  # problem takes 7 iterations
+        maxiter = 2  # problem takes 7 iterations
         res = linprog(c, A_ub=A, b_ub=b, method=self.method,
                       options={"maxiter": maxiter})
         # maxiter is independent of sparse/dense
@@ -1714,7 +1756,8 @@ class TestLinprogRSCommon(LinprogRSTests):
 
     def test_redundant_constraints_with_guess(self):
         A, b, c, N = magic_square(3)
-        p = np.random.rand(*c.shape)
+        # perturb c with the random numbers that follow it in its stream
+        p = np.random.RandomState(0).rand(2, c.size)[1]
         with suppress_warnings() as sup:
             sup.filter(OptimizeWarning, "A_eq does not appear...")
             sup.filter(RuntimeWarning, "invalid value encountered")
@@ -1749,7 +1792,8 @@ class TestAutoscaleIP(AutoscaleTests):
     method = "interior-point"
 
     def test_bug_6139(self):
-        self.options['tol'] = 1e-10
+        # don't modify the options dict shared with the other autoscale tests
+        self.options = dict(self.options, tol=1e-10)
         return AutoscaleTests.test_bug_6139(self)
 
 